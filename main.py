@@ -6,21 +6,31 @@ WOW Sound Show (single file, no pip)
 ------------------------------------
 Un "effet waouw" en console sans dessin : mini show sonore (mélodie + effets).
 - Windows : son propre via winsound (fréquences + durées)
-- macOS/Linux : fallback beep terminal (si le terminal/OS l'autorise)
+- macOS/Linux : afplay/paplay/aplay si disponible, sinon beep terminal
+  (si le terminal/OS l'autorise)
 
 Touches:
   Espace : rejouer le show
   q      : quitter
 """
 
+import io
 import os
 import sys
 import time
 import math
 import random
 import signal
+import queue
+import threading
+import shutil
+import subprocess
+import tempfile
+import wave
+from array import array
 
 IS_WINDOWS = (os.name == "nt")
+IDLE_WAIT = 0.25  # s, attente max d'une touche (borne pour les signaux)
 
 # ----------- Non-blocking input -----------
 
@@ -29,7 +39,20 @@ class KeyReader:
         self.is_windows = IS_WINDOWS
         self._old = None
 
-        if not self.is_windows:
+        if self.is_windows:
+            import ctypes
+            # getwch() passe la console en mode brut : on sauve le mode
+            # d'entrée pour le restaurer à la fermeture (comme termios)
+            self.kernel32 = ctypes.windll.kernel32
+            self.h_in = self.kernel32.GetStdHandle(-10)  # STD_INPUT_HANDLE
+            mode = ctypes.c_uint32()
+            if self.kernel32.GetConsoleMode(self.h_in, ctypes.byref(mode)):
+                self._old = mode.value
+
+            # lecture bloquante dans un thread : plus de polling kbhit()
+            self._keys = queue.Queue()
+            threading.Thread(target=self._read_keys, daemon=True).start()
+        else:
             import termios, tty
             self.termios = termios
             self.tty = tty
@@ -37,19 +60,31 @@ class KeyReader:
             self._old = termios.tcgetattr(self.fd)
             tty.setcbreak(self.fd)
 
+    def _read_keys(self):
+        import msvcrt
+        while True:
+            self._keys.put(msvcrt.getwch())
+
     def close(self):
-        if not self.is_windows and self._old is not None:
+        if self._old is None:
+            return
+        if self.is_windows:
+            self.kernel32.SetConsoleMode(self.h_in, self._old)
+        else:
             self.termios.tcsetattr(self.fd, self.termios.TCSADRAIN, self._old)
 
-    def get_key(self):
+    def get_key(self, timeout: float = 0.0):
+        """Return the next key, waiting at most `timeout` seconds, else None."""
         if self.is_windows:
-            import msvcrt
-            if msvcrt.kbhit():
-                return msvcrt.getwch()
-            return None
+            try:
+                if timeout > 0:
+                    return self._keys.get(timeout=timeout)
+                return self._keys.get_nowait()
+            except queue.Empty:
+                return None
         else:
             import select
-            r, _, _ = select.select([sys.stdin], [], [], 0)
+            r, _, _ = select.select([sys.stdin], [], [], timeout)
             if r:
                 return sys.stdin.read(1)
             return None
@@ -70,36 +105,29 @@ def beep(f_hz: int, ms: int):
         sys.stdout.flush()
         time.sleep(ms / 1000.0)
 
+_NOTE_NAMES = {"C":0, "C#":1, "DB":1, "D":2, "D#":3, "EB":3, "E":4,
+               "F":5, "F#":6, "GB":6, "G":7, "G#":8, "AB":8, "A":9,
+               "A#":10, "BB":10, "B":11}
+
+# table note -> Hz, calculée une fois au chargement (octaves -1 à 11,
+# soit au-delà de MIDI 0..127)
+# MIDI note number: C4=60, A4=69
+_NOTE_HZ = {"R": 0}  # rest
+for _octave in range(-1, 12):
+    for _key, _n in _NOTE_NAMES.items():
+        _midi = (_octave + 1) * 12 + _n
+        _NOTE_HZ[f"{_key}{_octave}"] = int(round(440.0 * (2 ** ((_midi - 69) / 12))))
+del _octave, _key, _n, _midi
+
 def note_freq(note: str) -> int:
     """
     Convert note name to frequency in Hz.
-    note examples: "C4", "D#5", "A3"
+    note examples: "C4", "D#5", "A3" (octaves -1 to 11, "R" = rest)
     """
-    note = note.strip().upper()
-    if note == "R":  # rest
-        return 0
-
-    names = {"C":0, "C#":1, "DB":1, "D":2, "D#":3, "EB":3, "E":4,
-             "F":5, "F#":6, "GB":6, "G":7, "G#":8, "AB":8, "A":9,
-             "A#":10, "BB":10, "B":11}
-
-    # parse
-    if len(note) < 2:
-        raise ValueError(f"Bad note: {note}")
-
-    if note[1] in ("#", "B"):
-        key = note[:2]
-        octave = int(note[2:])
-    else:
-        key = note[:1]
-        octave = int(note[1:])
-
-    n = names[key]
-    # MIDI note number: C4=60, A4=69
-    midi = (octave + 1) * 12 + n
-    a4 = 69
-    freq = 440.0 * (2 ** ((midi - a4) / 12))
-    return int(round(freq))
+    try:
+        return _NOTE_HZ[note.strip().upper()]
+    except KeyError:
+        raise ValueError(f"Bad note: {note}") from None
 
 def play_tone(freq: int, ms: int):
     if freq <= 0:
@@ -107,60 +135,168 @@ def play_tone(freq: int, ms: int):
     else:
         beep(freq, ms)
 
+SAMPLE_RATE = 22050
+FADE_MS = 3  # attaque/relâche courte pour éviter les clics entre notes
+
+def render_wav(score) -> bytes:
+    """Synthesize a list of (freq, ms) into a mono 16-bit WAV (rest: freq <= 0)."""
+    samples = array("h")
+    amp = 0.3 * 32767
+    fade = max(1, SAMPLE_RATE * FADE_MS // 1000)
+    for freq, ms in score:
+        n = int(ms * SAMPLE_RATE / 1000)
+        if freq <= 0:
+            samples.extend(array("h", bytes(2 * n)))
+            continue
+        w = 2 * math.pi * freq / SAMPLE_RATE
+        for i in range(n):
+            env = min(1.0, i / fade, (n - i) / fade)
+            samples.append(int(amp * env * math.sin(w * i)))
+
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(samples.tobytes())
+    return out.getvalue()
+
+def _find_player():
+    for name in ("afplay", "paplay", "aplay"):
+        path = shutil.which(name)
+        if path:
+            return [path, "-q"] if name == "aplay" else [path]
+    return None
+
+class ScorePlayer:
+    """
+    Play a whole score asynchronously, in one call, from a temp WAV file.
+    Windows: winsound (SND_ASYNC). Else: afplay/paplay/aplay in background.
+    Without a usable backend, falls back to blocking note-by-note beeps.
+    """
+    def __init__(self):
+        self._score = []
+        self._path = None
+        self._proc = None
+        self._end = 0.0
+
+    def play(self, score):
+        self.stop()
+        self._score = score
+        cmd = None if IS_WINDOWS else _find_player()
+        if IS_WINDOWS or cmd:
+            try:
+                # afplay ne lit pas stdin, et SND_MEMORY refuse SND_ASYNC :
+                # on passe par un fichier temporaire
+                fd, self._path = tempfile.mkstemp(suffix=".wav")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(render_wav(score))
+                if IS_WINDOWS:
+                    import winsound
+                    winsound.PlaySound(self._path, winsound.SND_FILENAME
+                                       | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+                    # winsound ne dit pas quand le son est fini : on chronomètre
+                    self._end = time.monotonic() + sum(ms for _, ms in score) / 1000.0
+                else:
+                    self._proc = subprocess.Popen(cmd + [self._path],
+                                                  stdout=subprocess.DEVNULL,
+                                                  stderr=subprocess.DEVNULL)
+                return
+            except (OSError, RuntimeError):  # RuntimeError: winsound sans carte son
+                self._remove_file()
+        self._play_notes()
+
+    def is_playing(self) -> bool:
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                return True
+            failed = self._proc.returncode != 0
+            self._proc = None
+            self._remove_file()
+            if failed:
+                # lecteur en échec (pas de périphérique, ...) : repli note par note
+                self._play_notes()
+            return False
+        if self._path is not None and time.monotonic() < self._end:
+            return True
+        self._remove_file()
+        return False
+
+    def stop(self):
+        if self._proc is not None:
+            self._proc.terminate()
+            self._proc.wait()
+            self._proc = None
+        elif IS_WINDOWS and self._path is not None:
+            import winsound
+            # SND_PURGE n'est plus géré : None arrête le son en cours
+            winsound.PlaySound(None, 0)
+        self._remove_file()
+
+    def _play_notes(self):
+        for freq, ms in self._score:
+            play_tone(freq, ms)
+
+    def _remove_file(self):
+        if self._path is not None:
+            try:
+                os.remove(self._path)
+            except OSError:
+                pass
+            self._path = None
+
 # ----------- Show content -----------
+# chaque effet produit des (fréquence, durée ms) ; show() assemble la partition
 
 def laser_sweep():
     # effet "laser": fréquence qui monte vite, puis retombe
     for i in range(18):
         f = 600 + i * 140
-        play_tone(f, 18)
+        yield f, 18
     for i in range(12):
         f = 3200 - i * 170
-        play_tone(f, 16)
+        yield f, 16
 
 def explosion():
     # pseudo explosion: bruit "granuleux" par beeps aléatoires
     for i in range(28):
         f = random.randint(80, 800) + int((28 - i) * 25)
-        play_tone(f, 12)
+        yield f, 12
+
+# partitions fixes, converties en Hz une fois au chargement
+_SCORE_ARPEGGIO = [(note_freq(n), d) for n, d in [
+    ("E4", 110), ("G4", 110), ("B4", 110), ("E5", 180),
+    ("D5", 90), ("B4", 90), ("G4", 120), ("B4", 140),
+    ("C5", 160), ("G4", 90), ("E4", 180),
+]]
+
+_SCORE_FANFARE = [(note_freq(n), d) for n, d in [
+    ("C4", 120), ("E4", 120), ("G4", 120), ("C5", 220),
+    ("R", 70),
+    ("A4", 120), ("B4", 120), ("C5", 220),
+    ("R", 70),
+    ("G4", 120), ("E4", 120), ("C4", 260),
+]]
 
 def arpeggio():
     # petit arpège "cinématique"
-    seq = [
-        ("E4", 110), ("G4", 110), ("B4", 110), ("E5", 180),
-        ("D5", 90), ("B4", 90), ("G4", 120), ("B4", 140),
-        ("C5", 160), ("G4", 90), ("E4", 180),
-    ]
-    for n, d in seq:
-        play_tone(note_freq(n), d)
+    yield from _SCORE_ARPEGGIO
 
 def fanfare():
     # fanfare courte + effet waouw final
-    seq = [
-        ("C4", 120), ("E4", 120), ("G4", 120), ("C5", 220),
-        ("R", 70),
-        ("A4", 120), ("B4", 120), ("C5", 220),
-        ("R", 70),
-        ("G4", 120), ("E4", 120), ("C4", 260),
-    ]
-    for n, d in seq:
-        play_tone(note_freq(n) if n != "R" else 0, d)
+    yield from _SCORE_FANFARE
 
 def wow_finale():
     # montée progressive + petit "sparkle"
     for i in range(22):
         f = 240 + int(i * 95 + 40 * math.sin(i * 0.9))
-        play_tone(f, 22)
+        yield f, 22
     for _ in range(14):
-        play_tone(random.randint(1200, 3200), 18)
+        yield random.randint(1200, 3200), 18
 
 def show():
-    # ordre du show
-    laser_sweep()
-    arpeggio()
-    explosion()
-    fanfare()
-    wow_finale()
+    # ordre du show : partition complète, jouée en une fois par ScorePlayer
+    return [*laser_sweep(), *arpeggio(), *explosion(), *fanfare(), *wow_finale()]
 
 # ----------- UI (no drawing, no scrolling dependency) -----------
 
@@ -184,23 +320,42 @@ def main():
     print_header()
 
     reader = KeyReader()
+    player = ScorePlayer()
     try:
         # lance une première fois
-        show()
+        player.play(show())
+        replays = 0     # Espace pendant le show : rejoué ensuite
+        announce = False
 
         while True:
-            k = reader.get_key()
+            # attend la touche : réveil immédiat à l'appui (Ctrl+C compris,
+            # voir '\x03' plus bas). La borne IDLE_WAIT rend la main à
+            # l'interpréteur pour exécuter les handlers de signaux (SIGTERM) :
+            # sous Windows une attente de verrou n'est pas interrompue par eux.
+            # Elle sert aussi à voir la fin du show en cours.
+            k = reader.get_key(IDLE_WAIT)
             if k:
+                if k == "\x03":
+                    # Ctrl+C : sous Windows getwch() le renvoie comme touche
+                    cleanup()
                 if k.lower() == "q":
                     break
                 if k == " ":
-                    sys.stdout.write("▶️  Showtime !\n")
-                    sys.stdout.flush()
-                    show()
+                    replays += 1
+
+            if not player.is_playing():
+                if announce:
                     sys.stdout.write("✅  (Espace pour rejouer)\n")
                     sys.stdout.flush()
-            time.sleep(0.02)
+                    announce = False
+                if replays:
+                    replays -= 1
+                    sys.stdout.write("▶️  Showtime !\n")
+                    sys.stdout.flush()
+                    player.play(show())
+                    announce = True
     finally:
+        player.stop()
         reader.close()
 
 if __name__ == "__main__":